@@ -4,6 +4,7 @@ Common functions and classes for implementing dataframe verbs
 import itertools
 import re
 from contextlib import suppress
+from functools import lru_cache
 
 import pandas as pd
 import pandas.api.types as pdtypes
@@ -11,7 +12,54 @@ import numpy as np
 
 from ..expressions import Expression
 from ..types import GroupedDataFrame
-from ..utils import get_empty_env
+from ..utils import get_empty_env, _column_positions
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern):
+    """
+    Cached re.compile
+    """
+    return re.compile(pattern)
+
+
+@lru_cache(maxsize=256)
+def _combine_patterns(patterns):
+    """
+    Combine regex patterns into a single pattern
+
+    The combined pattern matches a string if any of the
+    patterns matches it. Each string is matched once, instead
+    of once for every pattern.
+
+    Parameters
+    ----------
+    patterns : tuple
+        Compiled regex patterns
+
+    Returns
+    -------
+    out : re.Pattern or None
+        Combined pattern. ``None`` if there are fewer than two
+        patterns or they cannot be combined without changing
+        what they match, i.e. when they have groups or flags.
+
+    Examples
+    --------
+    >>> _combine_patterns((re.compile('ca.+'), re.compile('lion')))
+    re.compile('(?:ca.+)|(?:lion)')
+    >>> _combine_patterns((re.compile('(ca).+'), re.compile('lion')))
+    >>> _combine_patterns((re.compile('ca.+', re.I), re.compile('lion')))
+    """
+    default_flags = re.compile('').flags
+    combinable = (
+        len(patterns) > 1 and
+        all(isinstance(p.pattern, str) for p in patterns) and
+        all(p.groups == 0 and p.flags == default_flags for p in patterns)
+    )
+    if not combinable:
+        return None
+    return re.compile('|'.join('(?:{})'.format(p.pattern) for p in patterns))
 
 
 def _get_groups(verb):
@@ -29,14 +77,46 @@ def _get_base_dataframe(df):
     Remove all columns other than those grouped on
     """
     if isinstance(df, GroupedDataFrame):
-        base_df = GroupedDataFrame(
-            df.loc[:, df.plydata_groups], df.plydata_groups,
-            copy=True)
+        # loc makes a copy
+        base_df = GroupedDataFrame._from_frame(
+            df.loc[:, df.plydata_groups], df.plydata_groups)
     else:
         base_df = pd.DataFrame(index=df.index)
     return base_df
 
 
+def _copy(df):
+    """
+    Return a copy of the dataframe that is independent of the input
+
+    The data is only shared if pandas copy-on-write is enabled,
+    then changes to either dataframe do not affect the other.
+    Groups are preserved.
+
+    >>> df = GroupedDataFrame({'x': [1, 2, 3]}, groups=['x'])
+    >>> df2 = _copy(df)
+    >>> df2.columns = ['y']
+    >>> df2.loc[0, 'y'] = 99
+    >>> df2
+    groups: ['x']
+        y
+    0  99
+    1   2
+    2   3
+    >>> df
+    groups: ['x']
+       x
+    0  1
+    1  2
+    2  3
+    """
+    try:
+        copy_on_write = pd.get_option('mode.copy_on_write') is True
+    except KeyError:
+        copy_on_write = False
+    return df.copy(deep=not copy_on_write)
+
+
 def _add_group_columns(data, gdf):
     """
     Add group columns to data with a value from the grouped dataframe
@@ -325,7 +405,7 @@ class Evaluator:
 
         # Maybe this should happen in the verb functions
         if self.keep_groups and self.groups:
-            edata = GroupedDataFrame(edata, groups=self.groups)
+            edata = GroupedDataFrame._from_frame(edata, self.groups)
         return edata
 
 
@@ -372,6 +452,11 @@ class Selector:
 
     @classmethod
     def verify_columns(cls, selected, data_columns):
+        positions = _column_positions(data_columns)
+        if (positions is not None and
+                all(col in positions for col in selected)):
+            return selected
+
         missing_columns = selected.difference(
             data_columns,
             sort=False
@@ -425,33 +510,50 @@ class Selector:
             c1 = missing + [x for x in names if x not in missing_set]
             lst.append(c1)
 
+        if verb.startswith or verb.endswith or contains or matches:
+            # Only string names are matched. Matching is done on
+            # all the names at once.
+            is_str = np.array([isinstance(x, str) for x in columns],
+                              dtype=bool)
+            str_columns = columns[is_str]
+            str_names = np.array(list(str_columns), dtype=str)
+
+        def matching(func, values):
+            mask = np.zeros(len(str_names), dtype=bool)
+            for value in values:
+                mask |= func(value)
+            return list(str_columns[mask])
+
         if verb.startswith:
-            c2 = [x for x in columns
-                  if isinstance(x, str) and x.startswith(verb.startswith)]
+            c2 = matching(
+                lambda s: np.char.startswith(str_names, s),
+                verb.startswith)
             lst.append(c2)
 
         if verb.endswith:
-            c3 = [x for x in columns if
-                  isinstance(x, str) and x.endswith(verb.endswith)]
+            c3 = matching(
+                lambda s: np.char.endswith(str_names, s),
+                verb.endswith)
             lst.append(c3)
 
         if contains:
-            c4 = []
-            for col in columns:
-                if (isinstance(col, str) and
-                        any(s in col for s in contains)):
-                    c4.append(col)
+            c4 = matching(
+                lambda s: np.char.find(str_names, s) >= 0,
+                contains)
             lst.append(c4)
 
         if matches:
-            c5 = []
-            patterns = [x if hasattr(x, 'match') else re.compile(x)
-                        for x in matches]
-            for col in columns:
-                if isinstance(col, str):
-                    if any(bool(p.match(col)) for p in patterns):
-                        c5.append(col)
-
+            patterns = tuple(
+                x if hasattr(x, 'match') else _compile_pattern(x)
+                for x in matches)
+            combined = _combine_patterns(patterns)
+            if combined is not None:
+                patterns = (combined,)
+            obj_names = np.asarray(str_columns, dtype=object)
+            c5 = matching(
+                lambda p: np.frompyfunc(p.match, 1, 1)(
+                    obj_names).astype(bool),
+                patterns)
             lst.append(c5)
 
         selected = pd.Index(list(itertools.chain(*lst))).drop_duplicates()
@@ -66,7 +66,7 @@ def count(verb):
 
     # Restore original groups
     if groups:
-        data = GroupedDataFrame(data, groups, copy=False)
+        data = GroupedDataFrame._from_frame(data, groups)
     return data
 
 
@@ -98,7 +98,7 @@ def add_count(verb):
 
     if groups:
         # Restore original groups
-        data = GroupedDataFrame(data, groups, copy=False)
+        data = GroupedDataFrame._from_frame(data, groups)
     else:
         # Remove counted groups
         data = pd.DataFrame(data, copy=False)
@@ -1,17 +1,23 @@
 """
 One table verb implementations for a :class:`pandas.DataFrame`
 """
+import ast
 import warnings
+from functools import lru_cache
 
 import numpy as np
 import pandas as pd
+import pandas.api.types as pdtypes
+from pandas.core import algorithms
 
+from ..expressions import Expression, _column_array, _dotted_name
+from ..expressions import _lookup_function
 from ..types import GroupedDataFrame
 from ..options import get_option
 from ..operators import register_implementations
-from ..utils import Q, get_empty_env, regular_index
+from ..utils import Q, get_empty_env, regular_index, _column_positions
 from .common import Evaluator, Selector
-from .common import _get_groups, _get_base_dataframe
+from .common import _get_groups, _get_base_dataframe, _copy
 
 __all__ = ['arrange', 'create', 'define', 'distinct', 'do',
            'group_by', 'group_indices', 'head',  'mutate',
@@ -45,6 +51,8 @@ def _check_modify_groups(verb):
 
 
 def define(verb):
+    # A deep copy, assigning to existing columns of a shallow
+    # copy can write into the data of the input.
     if not get_option('modify_input_data'):
         verb.data = verb.data.copy()
 
@@ -55,6 +63,9 @@ def define(verb):
     verb.env = verb.env.with_outer_namespace(_outer_namespace)
     with regular_index(verb.data):
         new_data = Evaluator(verb).process()
+        if new_data is verb.data:
+            return verb.data
+
         for col in new_data:
             verb.data[col] = new_data[col]
     return verb.data
@@ -80,57 +91,195 @@ def sample_frac(verb):
 
 def select(verb):
     columns = Selector.get(verb)
-    data = verb.data.loc[:, columns]
-    return data
+    positions = _column_positions(verb.data.columns)
+    try:
+        locs = [positions[col] for col in columns]
+    except (KeyError, TypeError):
+        # Labels that only Index.get_loc can match
+        return verb.data.loc[:, columns]
+    return verb.data.iloc[:, locs]
 
 
 def rename(verb):
-    inplace = get_option('modify_input_data')
-    data = verb.data.rename(columns=verb.lookup, inplace=inplace)
-    return verb.data if inplace else data
+    if get_option('modify_input_data'):
+        data = verb.data
+    else:
+        data = _copy(verb.data)
+
+    columns = data.columns
+    positions = _column_positions(columns)
+    if positions is None:
+        data.rename(columns=verb.lookup, inplace=True)
+        return data
+
+    # Only the renamed labels are looked up and replaced.
+    # Like DataFrame.rename, unknown names are ignored.
+    # The dtype of the new labels is inferred from a list, the
+    # same way across pandas versions.
+    labels = columns.tolist()
+    for old, new in verb.lookup.items():
+        i = positions.get(old)
+        if i is not None:
+            labels[i] = new
+    data.columns = pd.Index(labels, name=columns.name, tupleize_cols=False)
+    return data
 
 
 def distinct(verb):
+    if verb.expressions and not get_option('modify_input_data'):
+        data = _distinct_computed(verb)
+        if data is not None:
+            return data
+
     data = define(verb)
-    return data.drop_duplicates(subset=verb.columns,
-                                keep=verb.keep)
+    return data[~_duplicated(data, verb.columns, verb.keep)]
+
+
+def _distinct_computed(verb):
+    """
+    Distinct rows, with computed columns as part of the key
+
+    The computed columns are evaluated on the input data
+    without copying it. Only the distinct rows are copied and
+    the computed columns added to them.
+
+    Parameters
+    ----------
+    verb : distinct
+        Verb with expressions
+
+    Returns
+    -------
+    out : pandas.DataFrame or None
+        Distinct rows. ``None`` if the computed columns do not
+        have a value for each row.
+    """
+    _check_modify_groups(verb)
+    verb.env = verb.env.with_outer_namespace(_outer_namespace)
+    with regular_index(verb.data):
+        new_data = Evaluator(verb).process()
+
+    if len(new_data) != len(verb.data):
+        return None
+
+    # Both dataframes have the same rows, they are
+    # combined by position.
+    keys = pd.DataFrame({
+        i: (new_data[col] if col in new_data else verb.data[col]).array
+        for i, col in enumerate(verb.columns)
+    })
+    rows = np.flatnonzero(~_duplicated(keys, None, verb.keep))
+    data = verb.data.iloc[rows]
+    data._is_copy = None
+    if new_data is verb.data:
+        return data
+
+    new_data = new_data.iloc[rows]
+    for col in new_data:
+        data[col] = new_data[col].array
+    return data
+
+
+def _duplicated(data, columns, keep):
+    """
+    Return boolean array that marks duplicate rows
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Data
+    columns : list or None
+        Columns that identify the rows. If ``None``, all the
+        columns are used.
+    keep : str or bool
+        Which of the duplicates not to mark. One of
+        ``'first'``, ``'last'`` or ``False``.
+
+    Returns
+    -------
+    out : numpy.ndarray
+        True for the rows that are duplicates.
+    """
+    if columns is not None and len(columns) == 1:
+        # Skip the dataframe machinery and hash the column values
+        values = _column_array(data, columns[0])
+        if values is not None:
+            return algorithms.duplicated(values, keep=keep)
+
+    return data.duplicated(subset=columns, keep=keep).to_numpy()
 
 
 def arrange(verb):
     # Do not evaluate if all statements correspond to
     # columns already in the dataframe
     stmts = [expr.stmt for expr in verb.expressions]
-    has_all_columns = all(stmt in verb.data for stmt in stmts)
-    if has_all_columns:
+    positions = _column_positions(verb.data.columns)
+    try:
+        locs = [positions[stmt] for stmt in stmts]
+    except (KeyError, TypeError):
+        locs = None
+
+    if locs is not None:
+        df = verb.data.iloc[:, locs]
+    elif positions is None and all(stmt in verb.data for stmt in stmts):
         df = verb.data.loc[:, stmts]
     else:
         verb.env = verb.env.with_outer_namespace({'Q': Q})
         df = Evaluator(verb, keep_index=True).process()
 
     if len(df.columns):
-        # The index is also rearranged, but to avoid issues with
-        # duplicate index values, we work with a regular index
-        original_index = verb.data.index
-        with regular_index(verb.data, df):
-            sorted_index = df.sort_values(by=list(df.columns)).index
-            data = verb.data.loc[sorted_index, :]
-
+        # Rows are taken by position, so duplicate index values
+        # are not a problem. The index is rearranged with them.
+        data = verb.data.take(_sort_order(df))
         if verb.reset_index:
             data.reset_index(drop=True, inplace=True)
-        else:
-            data.index = original_index[sorted_index]
     else:
         data = verb.data
 
     return data
 
 
+def _sort_order(df):
+    """
+    Return the positions of the rows that sort the dataframe
+
+    All the columns are sort keys, the first one is the
+    primary key. The sort is stable.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataframe of sort keys
+
+    Returns
+    -------
+    out : numpy.ndarray
+        Positions of the sorted rows
+
+    Examples
+    --------
+    >>> df = pd.DataFrame({'x': [2, 1, 2, 1], 'y': [4, 3, 2, 1]})
+    >>> _sort_order(df)
+    array([3, 1, 2, 0])
+    >>> df['y'] = list('dcba')
+    >>> _sort_order(df)
+    array([3, 1, 2, 0])
+    """
+    keys = [df.iloc[:, i].to_numpy() for i in range(len(df.columns))]
+    if all(k.dtype.kind in 'biuf' for k in keys):
+        # lexsort takes the primary key last
+        return np.lexsort(keys[::-1])
+
+    sorted_df = df.reset_index(drop=True).sort_values(
+        by=list(df.columns), kind='mergesort')
+    return sorted_df.index.to_numpy()
+
+
 def group_by(verb):
     verb._overwrite_groups = True
+    # define has made a copy (unless the input can be modified)
     verb.data = define(verb)
 
-    copy = not get_option('modify_input_data')
-
     try:
         add = verb.add_
     except AttributeError:
@@ -142,13 +291,13 @@ def group_by(verb):
         groups = verb.groups
 
     if groups:
-        return GroupedDataFrame(verb.data, groups, copy=copy)
+        return GroupedDataFrame(verb.data, groups, copy=False)
     else:
-        return pd.DataFrame(verb.data, copy=copy)
+        return pd.DataFrame(verb.data, copy=False)
 
 
 def ungroup(verb):
-    return pd.DataFrame(verb.data)
+    return pd.DataFrame(verb.data, copy=False)
 
 
 def group_indices(verb):
@@ -169,6 +318,10 @@ def group_indices(verb):
 
 def summarize(verb):
     verb.env = verb.env.with_outer_namespace(_outer_namespace)
+    data = _summarize_groups(verb)
+    if data is not None:
+        return data
+
     with regular_index(verb.data):
         data = Evaluator(
             verb,
@@ -177,25 +330,104 @@ def summarize(verb):
     return data
 
 
+def _summarize_groups(verb):
+    """
+    Summarize groups using vectorized aggregations
+
+    This is possible when the data is grouped and all the
+    expressions are aggregations of numeric columns, e.g.
+    ``mean(x)``, ``np.sum(y)``, ``nth(x, 2)`` and ``n()``. All the groups are
+    aggregated together, without splitting the data.
+
+    Parameters
+    ----------
+    verb : summarize
+        Verb
+
+    Returns
+    -------
+    out : pandas.DataFrame or None
+        Summarized data. ``None`` if the data cannot be
+        summarized with vectorized aggregations.
+    """
+    data = verb.data
+    if (not isinstance(data, GroupedDataFrame) or
+            not data.plydata_groups or
+            not len(data) or
+            not verb.expressions):
+        return None
+
+    groups = data.plydata_groups
+    if any(pdtypes.is_categorical_dtype(data[g]) for g in groups):
+        return None
+
+    aggregations = []
+    for expr in verb.expressions:
+        if not isinstance(expr.stmt, str) or expr.column in groups:
+            return None
+
+        parsed = _parse_aggregation(expr.stmt)
+        if parsed is None:
+            return None
+
+        name, column, args = parsed
+        if name == 'n' and column is None and not args:
+            aggregations.append((expr.column, _group_size, None, ()))
+            continue
+        elif column is None or column not in data:
+            return None
+
+        func = _lookup_function(name, data, verb.env)
+        try:
+            aggregate = _group_aggregations.get(func)
+        except TypeError:
+            return None
+
+        if aggregate is _group_nth:
+            if len(args) != 1 or type(args[0]) is not int:
+                return None
+        elif args:
+            return None
+
+        values = _column_array(data, column)
+        if (aggregate is None or
+                values is None or
+                (values.dtype not in _group_aggregation_dtypes and
+                 aggregate is not _group_n_distinct)):
+            return None
+        aggregations.append((expr.column, aggregate, column, args))
+
+    codes = data._group_codes()
+    n_groups = codes.max() + 1
+    if n_groups < 1:
+        return None
+
+    # Rows of the same group are made contiguous. The rows
+    # without a group sort first and are left out.
+    order = np.argsort(codes, kind='stable')
+    order = order[np.sum(codes < 0):]
+    sizes = np.bincount(codes[order], minlength=n_groups)
+    starts = np.cumsum(sizes) - sizes
+
+    first_rows = order[starts]
+    result = pd.DataFrame({
+        g: data[g].iloc[first_rows].reset_index(drop=True)
+        for g in groups
+    })
+    for col, aggregate, column, args in aggregations:
+        values = None if column is None else _column_array(data, column)[order]
+        result[col] = aggregate(values, starts, sizes, *args)
+    return result
+
+
 def query(verb):
     if isinstance(verb.data, GroupedDataFrame):
         grouper = verb.data.groupby()
-        dfs = [
-            gdf.query(
-                verb.expression,
-                global_dict=verb.env.namespace,
-                **verb.kwargs
-            )
-            for _, gdf in grouper
-        ]
+        dfs = [_query(gdf, verb) for _, gdf in grouper]
         data = pd.concat(dfs, axis=0, ignore_index=False, copy=False)
         data.plydata_groups = list(verb.data.plydata_groups)
     else:
-        data = verb.data.query(
-            verb.expression,
-            global_dict=verb.env.namespace,
-            **verb.kwargs
-        )
+        data = _query(verb.data, verb)
         data._is_copy = None
 
     if verb.reset_index:
@@ -203,6 +435,107 @@ def query(verb):
     return data
 
 
+def _query(data, verb):
+    """
+    Return rows of the data that match the query expression
+
+    If python evaluates the query expression the same way as
+    :meth:`pandas.DataFrame.query` would, the expression is
+    evaluated as an :class:`~plydata.expressions.Expression`.
+    This avoids the expression parsing that
+    :meth:`pandas.DataFrame.query` does on every call.
+    """
+    names = _query_names(verb.expression)
+    usable = (
+        names is not None and
+        not verb.kwargs and
+        data.columns.is_unique and
+        all(name in data for name in names)
+    )
+    if usable:
+        expr = Expression(verb.expression, None)
+        mask = np.asarray(expr.evaluate(data, verb.env))
+        if (mask.dtype == bool and
+                mask.ndim == 1 and
+                len(mask) == len(data)):
+            return data[mask]
+
+    return data.query(
+        verb.expression,
+        global_dict=verb.env.namespace,
+        **verb.kwargs
+    )
+
+
+# Nodes of query expressions that python evaluates the same
+# way as pandas.DataFrame.query
+_query_nodes = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare,
+    ast.Name, ast.Constant, ast.Attribute, ast.Call, ast.keyword,
+    ast.Load, ast.operator, ast.unaryop, ast.cmpop
+)
+
+
+@lru_cache(maxsize=256)
+def _query_names(expr):
+    """
+    Return the variables in a query expression
+
+    Parameters
+    ----------
+    expr : str
+        Query expression
+
+    Returns
+    -------
+    out : tuple or None
+        Names of the variables. ``None`` if python may evaluate
+        the expression differently from
+        :meth:`pandas.DataFrame.query`. e.g. In a query, ``&``
+        has the same precedence as ``and``, ``==`` compares
+        with all the values in a list and ``@`` marks a variable
+        in the environment.
+
+    Examples
+    --------
+    >>> _query_names('(x > 1) & (y < z.min())')
+    ('x', 'y', 'z')
+    >>> _query_names('x % 2 == 0 & y > 0') is None
+    True
+    >>> _query_names('x > @c') is None
+    True
+    """
+    try:
+        tree = ast.parse(expr, mode='eval')
+    except SyntaxError:
+        return None
+
+    names = []
+    for node in ast.walk(tree):
+        if (not isinstance(node, _query_nodes) or
+                isinstance(node, (ast.Not, ast.In, ast.NotIn,
+                                  ast.Is, ast.IsNot))):
+            return None
+        elif isinstance(node, ast.Call):
+            # Only methods e.g. x.min()
+            if not isinstance(node.func, ast.Attribute):
+                return None
+        elif isinstance(node, ast.Compare):
+            # No chained comparisons and no bitwise operators
+            # whose precedence differs in a query
+            if len(node.ops) > 1:
+                return None
+            for child in ast.walk(node):
+                if isinstance(child, (ast.BitAnd, ast.BitOr,
+                                      ast.BitXor, ast.Invert)):
+                    return None
+        elif isinstance(node, ast.Name):
+            if node.id not in names:
+                names.append(node.id)
+
+    return tuple(names)
+
+
 def do(verb):
     verb.env = get_empty_env()
     keep_index = verb.single_function
@@ -275,6 +608,20 @@ def _nth(arr, n):
         return np.nan
 
 
+def _first(arr):
+    """
+    Return the first value of array
+    """
+    return _nth(arr, 0)
+
+
+def _last(arr):
+    """
+    Return the last value of array
+    """
+    return _nth(arr, -1)
+
+
 def _n_distinct(arr):
     """
     Number of unique values in array
@@ -282,6 +629,146 @@ def _n_distinct(arr):
     return len(pd.unique(arr))
 
 
+@lru_cache(maxsize=256)
+def _parse_aggregation(stmt):
+    """
+    Parse statement of the form ``func(column, *constants)``
+
+    Parameters
+    ----------
+    stmt : str
+        Statement
+
+    Returns
+    -------
+    out : tuple or None
+        ``(func, column, constants)``, where *func* is the dotted
+        name of the function and *column* is ``None`` if the
+        function is called without arguments. ``None`` if the
+        statement is of a different form.
+
+    Examples
+    --------
+    >>> _parse_aggregation('np.mean(x)')
+    ('np.mean', 'x', ())
+    >>> _parse_aggregation('nth(x, -2)')
+    ('nth', 'x', (-2,))
+    >>> _parse_aggregation('n()')
+    ('n', None, ())
+    >>> _parse_aggregation('mean(x*2)') is None
+    True
+    """
+    try:
+        node = ast.parse(stmt, mode='eval').body
+    except SyntaxError:
+        return None
+
+    if not isinstance(node, ast.Call) or node.keywords:
+        return None
+
+    name = _dotted_name(node.func)
+    if not name:
+        return None
+
+    if not node.args:
+        return name, None, ()
+
+    column, *args = node.args
+    if not isinstance(column, ast.Name):
+        return None
+
+    try:
+        constants = tuple(ast.literal_eval(a) for a in args)
+    except ValueError:
+        return None
+
+    return name, column.id, constants
+
+
+# Vectorized aggregations of groups
+#
+# They take the values sorted by group, the start of each
+# group in the sorted values and the size of each group.
+# Like the pandas reductions, missing values are skipped.
+
+def _group_size(values, starts, sizes):
+    return sizes
+
+
+def _group_sum(values, starts, sizes):
+    if values.dtype.kind == 'f':
+        values = np.where(np.isnan(values), 0, values)
+    return np.add.reduceat(values, starts)
+
+
+def _group_mean(values, starts, sizes):
+    counts = sizes
+    if values.dtype.kind == 'f':
+        isnan = np.isnan(values)
+        counts = sizes - np.add.reduceat(isnan.astype(np.intp), starts)
+        values = np.where(isnan, 0, values)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.add.reduceat(values, starts, dtype=float) / counts
+
+
+def _group_min(values, starts, sizes):
+    return np.fmin.reduceat(values, starts)
+
+
+def _group_max(values, starts, sizes):
+    return np.fmax.reduceat(values, starts)
+
+
+def _group_nth(values, starts, sizes, n):
+    # Position of the nth value of each group, if the group
+    # has one. The others are NaN.
+    idx = starts + (n if n >= 0 else sizes + n)
+    valid = (idx >= starts) & (idx < starts + sizes)
+    if valid.all():
+        return values[idx]
+
+    result = np.full(len(starts), np.nan)
+    result[valid] = values[idx[valid]]
+    return result
+
+
+def _group_n_distinct(values, starts, sizes):
+    # Each distinct (group, value) pair is counted once for
+    # its group. Missing values are one distinct value, as in
+    # pd.unique.
+    codes, uniques = pd.factorize(values)
+    n_values = len(uniques) + 1
+    codes[codes < 0] = len(uniques)
+    group_codes = np.repeat(np.arange(len(starts)), sizes)
+    pairs = pd.unique(group_codes * n_values + codes)
+    return np.bincount(pairs // n_values, minlength=len(starts))
+
+
+def _group_first(values, starts, sizes):
+    return values[starts]
+
+
+def _group_last(values, starts, sizes):
+    return values[starts + sizes - 1]
+
+
+_group_aggregations = {
+    np.sum: _group_sum,
+    np.mean: _group_mean,
+    np.min: _group_min,
+    np.amin: _group_min,
+    np.max: _group_max,
+    np.amax: _group_max,
+    _first: _group_first,
+    _last: _group_last,
+    _nth: _group_nth,
+    _n_distinct: _group_n_distinct,
+}
+
+_group_aggregation_dtypes = {np.dtype('int64'), np.dtype('float64')}
+
+
 _outer_namespace = {
     'min': np.min,
     'max': np.max,
@@ -290,8 +777,8 @@ _outer_namespace = {
     'mean': np.mean,
     'median': np.median,
     'std': np.std,
-    'first': lambda x: _nth(x, 0),
-    'last': lambda x: _nth(x, -1),
+    'first': _first,
+    'last': _last,
     'nth': _nth,
     'n_distinct': _n_distinct,
     'n_unique': _n_distinct,
@@ -1,4 +1,6 @@
 from collections import OrderedDict
+from functools import lru_cache
+import ast
 import keyword
 import re
 
@@ -6,6 +8,13 @@ import pandas as pd
 import pandas.api.types as pdtypes
 import numpy as np
 
+from .utils import _column_positions
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
 __all__ = ['case_when', 'if_else']
 
 KEYWORDS = set(keyword.kwlist)
@@ -14,6 +23,373 @@ KEYWORDS = set(keyword.kwlist)
 # anywhere in an expression
 n_func_pattern = re.compile(r'\bn\(\)')
 
+# Smallest number of rows for which statements are evaluated
+# with numexpr. For smaller data, the cost of setting up numexpr
+# outweighs the savings from the fused & multithreaded evaluation.
+NUMEXPR_MIN_ROWS = 100000
+
+# Column dtypes that numexpr evaluates with the same results
+# as numpy
+NUMEXPR_DTYPES = {np.dtype('int64'), np.dtype('float64')}
+
+# {numpy function name: numexpr function name}
+NUMEXPR_FUNCTIONS = {
+    'sin': 'sin', 'cos': 'cos', 'tan': 'tan',
+    'arcsin': 'arcsin', 'arccos': 'arccos', 'arctan': 'arctan',
+    'arctan2': 'arctan2',
+    'sinh': 'sinh', 'cosh': 'cosh', 'tanh': 'tanh',
+    'arcsinh': 'arcsinh', 'arccosh': 'arccosh', 'arctanh': 'arctanh',
+    'exp': 'exp', 'expm1': 'expm1',
+    'log': 'log', 'log10': 'log10', 'log1p': 'log1p',
+    'sqrt': 'sqrt', 'abs': 'abs', 'absolute': 'abs',
+    'where': 'where'
+}
+
+NUMEXPR_OPERATORS = {
+    ast.Add: '+', ast.Sub: '-', ast.Mult: '*', ast.Div: '/',
+    ast.Pow: '**', ast.Mod: '%', ast.BitAnd: '&', ast.BitOr: '|',
+    ast.USub: '-', ast.UAdd: '+', ast.Invert: '~',
+    ast.Eq: '==', ast.NotEq: '!=', ast.Lt: '<', ast.LtE: '<=',
+    ast.Gt: '>', ast.GtE: '>='
+}
+
+
+def _dotted_name(node):
+    """
+    Return the dotted name of a Name or Attribute node
+
+    Parameters
+    ----------
+    node : ast.AST
+        Node
+
+    Returns
+    -------
+    out : str or None
+        Dotted name e.g. ``np.sin``. ``None`` if the node is
+        not a (dotted) name.
+
+    Examples
+    --------
+    >>> _dotted_name(ast.parse('np.random.rand', mode='eval').body)
+    'np.random.rand'
+    >>> _dotted_name(ast.parse('f(x).y', mode='eval').body) is None
+    True
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    elif isinstance(node, ast.Attribute):
+        name = _dotted_name(node.value)
+        return name and '{}.{}'.format(name, node.attr)
+
+
+@lru_cache(maxsize=256)
+def _numexpr_plan(stmt):
+    """
+    Translate a statement into an expression for numexpr
+
+    Only statements made up of arithmetic, comparisons and
+    calls to numpy functions that have numexpr equivalents
+    can be translated.
+
+    Parameters
+    ----------
+    stmt : str
+        Statement to translate
+
+    Returns
+    -------
+    out : tuple or None
+        ``(source, names, functions, node)``. *source* is the
+        numexpr expression, *names* are the variables in the
+        statement, *functions* are the ``(dotted_name,
+        numpy_name)`` of the functions called in the statement
+        and *node* is the parsed statement. ``None`` if the
+        statement cannot be evaluated by numexpr.
+
+    Examples
+    --------
+    >>> _numexpr_plan('np.sin(x) + y**2')[:3]
+    ('(sin(x) + (y ** 2))', ('x', 'y'), (('np.sin', 'sin'),))
+    >>> _numexpr_plan('np.cumsum(x)') is None
+    True
+    """
+    names = []
+    functions = []
+
+    def translate(node):
+        if isinstance(node, ast.BinOp):
+            return '({} {} {})'.format(
+                translate(node.left),
+                NUMEXPR_OPERATORS[type(node.op)],
+                translate(node.right))
+        elif isinstance(node, ast.UnaryOp):
+            return '({}{})'.format(
+                NUMEXPR_OPERATORS[type(node.op)],
+                translate(node.operand))
+        elif isinstance(node, ast.Compare) and len(node.ops) == 1:
+            return '({} {} {})'.format(
+                translate(node.left),
+                NUMEXPR_OPERATORS[type(node.ops[0])],
+                translate(node.comparators[0]))
+        elif isinstance(node, ast.Name):
+            if node.id not in names:
+                names.append(node.id)
+            return node.id
+        elif (isinstance(node, ast.Constant) and
+              type(node.value) in (int, float)):
+            return repr(node.value)
+        elif isinstance(node, ast.Call) and not node.keywords:
+            name = _dotted_name(node.func)
+            if not name:
+                raise ValueError('Unsupported function')
+            np_name = name.split('.')[-1]
+            functions.append((name, np_name))
+            return '{}({})'.format(
+                NUMEXPR_FUNCTIONS[np_name],
+                ', '.join(translate(arg) for arg in node.args))
+        raise ValueError('Unsupported node')
+
+    try:
+        node = ast.parse(stmt, mode='eval').body
+        source = translate(node)
+    except (SyntaxError, KeyError, ValueError):
+        return None
+
+    return source, tuple(names), tuple(functions), node
+
+
+def _numexpr_dtype(node, operands):
+    """
+    Return the dtype of the result when numpy evaluates a statement
+
+    It is used to check that numexpr gives the same result as
+    numpy, which is not always the case. e.g. ``abs`` of an
+    integer is a float and integer constants are int32.
+
+    Parameters
+    ----------
+    node : ast.AST
+        Parsed statement from :func:`_numexpr_plan`.
+    operands : dict
+        ``{name: dtype or scalar}`` for the variables in the
+        statement. Columns have a dtype and other variables
+        are scalars.
+
+    Returns
+    -------
+    out : numpy.dtype or None
+        Dtype of the result. ``None`` if numexpr cannot
+        reproduce the numpy result, e.g. integer ``%`` where
+        pandas gives NaN for division by zero, and integers
+        to integer powers that may be negative, which numpy
+        does not allow.
+
+    Examples
+    --------
+    >>> def dtype(stmt):
+    ...     node = _numexpr_plan(stmt)[3]
+    ...     return _numexpr_dtype(node, {'x': np.dtype('int64')})
+    >>> dtype('np.where(x > 0, 1, 0)')
+    dtype('int64')
+    >>> dtype('x / 2')
+    dtype('float64')
+    >>> dtype('x ** 2')
+    dtype('int64')
+    >>> dtype('x % 2') is None
+    True
+    >>> dtype('2 ** x') is None
+    True
+    """
+    def is_integer(operand):
+        return np.dtype(np.result_type(operand)).kind in 'iu'
+
+    def dtype(node):
+        if isinstance(node, ast.BinOp):
+            left, right = dtype(node.left), dtype(node.right)
+            if isinstance(node.op, ast.Div):
+                return np.result_type(left, right, np.float64)
+            elif (isinstance(node.op, ast.Mod) and
+                    (is_integer(left) or is_integer(right))):
+                raise ValueError('Integer modulo')
+            elif (isinstance(node.op, ast.Pow) and
+                    is_integer(left) and is_integer(right) and
+                    not (type(right) is int and right >= 0)):
+                raise ValueError('Integer power')
+            return np.result_type(left, right)
+        elif isinstance(node, ast.UnaryOp):
+            return np.result_type(dtype(node.operand))
+        elif isinstance(node, ast.Compare):
+            return np.dtype(bool)
+        elif isinstance(node, ast.Name):
+            return operands[node.id]
+        elif isinstance(node, ast.Constant):
+            return node.value
+        elif isinstance(node, ast.Call):
+            np_name = _dotted_name(node.func).split('.')[-1]
+            args = [dtype(arg) for arg in node.args]
+            if np_name == 'where':
+                return np.result_type(*args[1:])
+            elif not all(np.result_type(a).kind in 'if' for a in args):
+                raise ValueError('Unsupported argument')
+            elif NUMEXPR_FUNCTIONS[np_name] == 'abs' and is_integer(args[0]):
+                raise ValueError('Integer abs')
+            return np.result_type(*args, np.float64)
+        raise ValueError('Unsupported node')
+
+    try:
+        return np.dtype(dtype(node))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _lookup_function(name, data, env):
+    """
+    Lookup function that a statement would call
+
+    Parameters
+    ----------
+    name : str
+        Dotted name of the function e.g. ``np.sin``.
+    data : pandas.DataFrame
+        Data in whose namespace the statement is evaluated.
+        Columns shadow the variables in the environment.
+    env : EvalEnvironment
+        Environment in which to lookup the function.
+
+    Returns
+    -------
+    out : object or None
+        Function. ``None`` if the name cannot be resolved
+        or it is shadowed by a column.
+    """
+    root, *attrs = name.split('.')
+    if root in data:
+        return None
+    obj = env.namespace.get(root)
+    for attr in attrs:
+        obj = getattr(obj, attr, None)
+    return obj
+
+
+def _column_array(data, name):
+    """
+    Return the values of a column without creating a Series
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Data
+    name : object
+        Column name
+
+    Returns
+    -------
+    out : numpy.ndarray or pandas.api.extensions.ExtensionArray
+        Values of the column. ``None`` if *name* does not
+        identify a single column.
+
+    Examples
+    --------
+    >>> df = pd.DataFrame({'x': [1, 2], 'y': [3, 4]})
+    >>> _column_array(df, 'y')
+    array([3, 4])
+    >>> _column_array(df, 'z') is None
+    True
+    """
+    positions = _column_positions(data.columns)
+    try:
+        if positions is None:
+            loc = data.columns.get_loc(name)
+        else:
+            loc = positions[name]
+    except (KeyError, TypeError):
+        return None
+
+    if not isinstance(loc, int):
+        return None
+
+    try:
+        return data._get_column_array(loc)
+    except AttributeError:
+        return data.iloc[:, loc].to_numpy()
+
+
+def _numexpr_evaluate(stmt, data, env):
+    """
+    Evaluate statement using numexpr
+
+    Parameters
+    ----------
+    stmt : str
+        Statement to evaluate
+    data : pandas.DataFrame
+        Data in whose namespace the statement will be evaluated.
+    env : EvalEnvironment
+        Environment in which to lookup the non-column variables
+        and functions.
+
+    Returns
+    -------
+    out : pandas.Series or None
+        Result of the evaluation. ``None`` if numexpr is not
+        available, the data is too small or the statement
+        cannot be evaluated by numexpr.
+    """
+    if (numexpr is None or
+            not isinstance(data, pd.DataFrame) or
+            len(data) < NUMEXPR_MIN_ROWS):
+        return None
+
+    plan = _numexpr_plan(stmt)
+    if plan is None:
+        return None
+
+    source, names, functions, node = plan
+    namespace = env.namespace
+
+    # The functions must be the numpy functions
+    for name, np_name in functions:
+        obj = _lookup_function(name, data, env)
+        if obj is None or obj is not getattr(np, np_name, None):
+            return None
+
+    local_dict = {}
+    operands = {}
+    for name in names:
+        if name in data:
+            values = _column_array(data, name)
+            if values is None or values.dtype not in NUMEXPR_DTYPES:
+                return None
+            local_dict[name] = values
+            operands[name] = values.dtype
+        else:
+            value = namespace.get(name)
+            if type(value) not in (int, float):
+                return None
+            local_dict[name] = operands[name] = value
+
+    # Only scalars, nothing to gain
+    if not any(name in data for name in names):
+        return None
+
+    dtype = _numexpr_dtype(node, operands)
+    if dtype is None:
+        return None
+
+    try:
+        result = numexpr.evaluate(
+            source, local_dict=local_dict, global_dict={})
+    except (KeyError, NotImplementedError, TypeError, ValueError):
+        return None
+
+    # e.g. integer constants are int32 in numexpr
+    if result.dtype != dtype:
+        if not np.can_cast(result.dtype, dtype):
+            return None
+        result = result.astype(dtype)
+    return pd.Series(result, index=data.index)
+
 
 # Internal expression classes
 
@@ -87,13 +463,16 @@ class BaseExpression:
                 namespace = data
             # Avoid obvious keywords e.g if a column
             # is named class
-            if self.stmt not in KEYWORDS:
-                value = env.eval(
-                    self.stmt,
-                    source_name='Expression.evaluate',
-                    inner_namespace=namespace)
-            else:
+            if self.stmt in KEYWORDS:
                 value = namespace[self.stmt]
+            else:
+                # Large numeric data is best evaluated by numexpr
+                value = _numexpr_evaluate(self.stmt, data, env)
+                if value is None:
+                    value = env.eval(
+                        self.stmt,
+                        source_name='Expression.evaluate',
+                        inner_namespace=namespace)
         elif callable(self.stmt):
             value = self.stmt(data)
         else:
@@ -145,9 +145,9 @@ class sample_n(DataOperator):
         If weights do not sum to 1, they will be normalized to sum to 1.
         Missing values in the weights column will be treated as zero.
         inf and -inf values not allowed.
-    random_state : int or numpy.random.RandomState, optional
+    random_state : int, RandomState or Generator, optional
         Seed for the random number generator (if int), or numpy RandomState
-        object.
+        or Generator object.
     axis : int or string, optional
         Axis to sample. Accepts axis number or name. Default is stat axis
         for given data type (0 for Series and DataFrames, 1 for Panels).
@@ -197,9 +197,9 @@ class sample_frac(DataOperator):
         If weights do not sum to 1, they will be normalized to sum to 1.
         Missing values in the weights column will be treated as zero.
         inf and -inf values not allowed.
-    random_state : int or numpy.random.RandomState, optional
+    random_state : int, RandomState or Generator, optional
         Seed for the random number generator (if int), or numpy RandomState
-        object.
+        or Generator object.
     axis : int or string, optional
         Axis to sample. Accepts axis number or name. Default is stat axis
         for given data type (0 for Series and DataFrames, 1 for Panels).
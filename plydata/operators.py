@@ -19,6 +19,10 @@ dataclass_lookup = {
 
 DATASTORE_TYPES = tuple(dataclass_lookup.keys())
 
+# Resolved verb implementations
+# It is of the form {(type(data), 'verbname'): verbimplementation}
+_VERB_FUNCTIONS = {}
+
 
 def register_implementations(module, verb_names, datatype):
     """
@@ -36,6 +40,7 @@ def register_implementations(module, verb_names, datatype):
     """
     for name in verb_names:
         REGISTRY[datatype][name] = module[name]
+    _VERB_FUNCTIONS.clear()
 
 
 # We use this for "single dispatch" instead of maybe
@@ -45,6 +50,12 @@ def get_verb_function(data, verb):
     """
     Return function that implements the verb for given data type
     """
+    key = (type(data), verb)
+    try:
+        return _VERB_FUNCTIONS[key]
+    except KeyError:
+        pass
+
     try:
         datatype = dataclass_lookup[type(data)]
     except KeyError:
@@ -58,13 +69,15 @@ def get_verb_function(data, verb):
                 "Data of type {} is not supported.".format(type(data))
             )
     try:
-        return REGISTRY[datatype][verb]
+        func = REGISTRY[datatype][verb]
     except KeyError:
         raise TypeError(
             "Could not find a {} implementation for the verb {} ".format(
                 datatype, verb
             )
         )
+    _VERB_FUNCTIONS[key] = func
+    return func
 
 
 # Note: An alternate implementation would be to use a decorator
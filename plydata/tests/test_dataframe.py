@@ -94,6 +94,18 @@ def test_define():
     result = df >> define(y=pd.Series(y))
     assert all(result['y'] == y)
 
+    # New and replaced columns on a grouped dataframe with
+    # an irregular index
+    df2 = pd.DataFrame({'x': x, 'g': [1, 1, 2]}, index=[3, 1, 1])
+    result = df2 >> group_by('g') >> define(x='x*2', w=9, z='x+1')
+    assert list(result.columns) == ['x', 'g', 'w', 'z']
+    assert result.index.equals(df2.index)
+    assert result.plydata_groups == ['g']
+    assert all(result['x'] == x*2)
+    assert all(result['w'] == 9)
+    assert all(result['z'] == x + 1)
+    assert list(df2.columns) == ['x', 'g']
+
 
 def test_create():
     x = np.array([1, 2, 3])
@@ -137,6 +149,22 @@ def test_sample_n():
     df = pd.DataFrame({'x': range(20)})
     result = df >> sample_n(10)
     assert len(result) == 10
+    assert len(set(result['x'])) == 10
+
+    # Generators and seeds are reproducible
+    result1 = df >> sample_n(10, random_state=np.random.default_rng(123))
+    result2 = df >> sample_n(10, random_state=np.random.default_rng(123))
+    result3 = df >> sample_n(10, random_state=123)
+    result4 = df >> sample_n(10, random_state=123)
+    assert result1.equals(result2)
+    assert result3.equals(result4)
+
+    # The global numpy random state is used by default
+    np.random.seed(123)
+    result1 = df >> sample_n(10)
+    np.random.seed(123)
+    result2 = df >> sample_n(10)
+    assert result1.equals(result2)
 
 
 def test_sample_frac():
@@ -169,6 +197,10 @@ def test_select():
     result = df >> select(matches=(r'\w+opa', r'\w+r$'))
     assert len(result.columns) == 4
 
+    # Patterns with flags or groups
+    result = df >> select(matches=(re.compile('LION', re.I), r'(t)\w+'))
+    assert list(result.columns) == ['lion', 'tiger']
+
     # grouped on columns are never dropped
     result = df >> group_by('cougar') >> select(startswith='c', drop=True)
     assert len(result.columns) == 5
@@ -204,6 +236,18 @@ def test_select():
     result = df >> select()
     assert len(result.columns) == 0
     assert len(result.index) == len(df.index)
+
+    # Missing value column names
+    df2 = pd.DataFrame([[1, 2, 3]], columns=['lion', np.nan, 'tiger'])
+    result = df2 >> select(float('nan'), 'tiger')
+    assert result.columns[0] != result.columns[0]
+    assert list(result.columns[1:]) == ['tiger']
+
+    # Duplicate column names
+    df2 = pd.DataFrame([[1, 2, 3]], columns=['lion', 'tiger', 'lion'])
+    result = df2 >> select('tiger', 'lion')
+    assert list(result.columns) == ['tiger', 'lion', 'lion']
+
     df = pd.DataFrame({
         'lion': x, 'tiger': x, 'cheetah': x,
         'leopard': x, 'jaguar': x, 'cougar': x,
@@ -238,6 +282,19 @@ def test_rename():
     assert 'flap' in result.columns
     assert 'pin' in result.columns
 
+    # Unknown columns are ignored and the input is unchanged
+    result = df >> rename(pin='nail', gong='horn')
+    assert list(result.columns) == ['bell', 'whistle', 'pin', 'tail']
+    assert list(df.columns) == ['bell', 'whistle', 'nail', 'tail']
+
+    # Numerical column names
+    df2 = pd.DataFrame({1: x, 2: x})
+    result = df2 >> rename(one=1)
+    assert list(result.columns) == ['one', 2]
+    result = df2 >> rename({3: 1})
+    assert list(result.columns) == [3, 2]
+    assert pdtypes.is_integer_dtype(result.columns)
+
 
 def test_distinct():
     # Index                  0, 1, 2, 3, 4, 5, 6
@@ -270,6 +327,12 @@ def test_distinct():
     result2 = df >> distinct(['x'], z='x%2')
     assert result1.equals(result2)
 
+    # Computed column replaces an existing column
+    result = df >> distinct(['x'], 'last', y='y*10')
+    assert result.index.equals(I([0, 1, 2, 3, 5, 6]))
+    assert all(result['y'] == [10, 20, 30, 40, 50, 60])
+    assert all(df['y'] == [1, 2, 3, 4, 5, 5, 6])
+
     with pytest.raises(Exception):
         df >> distinct(['x'], 'last', 'cause_exception')
 
@@ -321,6 +384,11 @@ def test_arrange():
     result = df2 >> arrange('-y')
     assert all(result.y == [6, 5, 4, 3, 2, 1])
 
+    # Non-numeric keys are also sorted stably
+    df3 = df.assign(z=list('bbaaba'))
+    result = df3 >> arrange('z')
+    assert all(result.y == [3, 4, 6, 1, 2, 5])
+
 
 def test_group_by():
     df = pd.DataFrame({'x': [1, 5, 2, 2, 4, 0, 4],
@@ -369,6 +437,9 @@ def test_group_indices():
     results = df >> group_indices('y % 2')
     assert all(results == [1, 0, 1, 0, 1, 0, 1])
 
+    results = df >> group_indices('y % 2', 'x')
+    assert all(results == [3, 2, 4, 1, 5, 0, 5])
+
     results = df >> group_indices()
     assert all(results == [1, 1, 1, 1, 1, 1, 1])
 
@@ -560,6 +631,77 @@ class TestAggregateFunctions:
         result = self.df >> group_by('y') >> summarize('n()')
         assert all(result['n()'] == [2, 2, 1, 1])
 
+    def test_vectorized_groups(self):
+        # Aggregations that are computed for all groups at once
+        # give the same results as when computed group by group
+        df = pd.DataFrame({
+            'g': list('baabcbca'),
+            'h': [1, 1, 2, 1, 1, 1, 1, np.nan],
+            'x': [4, 1, 3, 2, 8, 7, 6, 5],
+            'y': [1.5, np.nan, 2.5, 0, np.nan, 1, np.nan, 3]
+        })
+        funcs = {
+            'sum': np.sum,
+            'mean': np.mean,
+            'min': np.min,
+            'max': np.max,
+        }
+        for name, func in funcs.items():
+            for col in ('x', 'y'):
+                stmt = '{}({})'.format(name, col)
+
+                def aggregate(gdf):
+                    return func(gdf[col])
+
+                result1 = df >> group_by('g', 'h') >> summarize(stmt)
+                result2 = (df
+                           >> group_by('g', 'h')
+                           >> summarize((stmt, aggregate)))
+                assert result1.equals(result2), stmt
+
+        def nth_value(n):
+            def func(s):
+                try:
+                    return s.iloc[n]
+                except IndexError:
+                    return np.nan
+            return func
+
+        funcs = {
+            'first({})': nth_value(0),
+            'last({})': nth_value(-1),
+            'nth({}, 1)': nth_value(1),
+            'nth({}, -2)': nth_value(-2),
+            'nth({}, 3)': nth_value(3),
+        }
+        for template, func in funcs.items():
+            for col in ('x', 'y'):
+                stmt = template.format(col)
+
+                def aggregate(gdf):
+                    return func(gdf[col])
+
+                result1 = df >> group_by('g') >> summarize(stmt)
+                result2 = (df
+                           >> group_by('g')
+                           >> summarize((stmt, aggregate)))
+                assert result1.equals(result2), stmt
+
+        # Missing values are counted as one distinct value
+        df['z'] = ['u', 'v', 'u', None, 'u', 'v', 'w', None]
+        for stmt in ('n_distinct(h)', 'n_unique(y)', 'n_distinct(z)'):
+            result1 = df >> group_by('g') >> summarize(stmt)
+            result2 = (df
+                       >> group_by('g')
+                       >> summarize((stmt, lambda gdf: len(
+                           pd.unique(gdf[stmt[-2]])))))
+            assert result1.equals(result2), stmt
+
+        result = df >> group_by('g') >> summarize('n()', s='np.sum(x)')
+        assert all(result['g'] == ['b', 'a', 'c'])
+        assert all(result['n()'] == [3, 3, 2])
+        assert all(result['s'] == [13, 9, 14])
+
 
 def test_query():
     df = pd.DataFrame({'x': [0, 1, 2, 3, 4, 5],
@@ -575,6 +717,20 @@ def test_query():
     result = df >> query('x % 2 == 0', reset_index=False)
     assert result.index.equals(pd.Index([0, 2, 4]))
 
+    # Same results as pandas whether or not python evaluates
+    # the expression
+    df['z'] = list('aabbcd')
+    for expr in ('x % 2 == 0 & y > 0',
+                 '(x % 2 == 0) & (y > 0)',
+                 'x % 2 == 0 and y > 0',
+                 '~(x > 2) | (z == "d")',
+                 'x == x.max()',
+                 'z.str.startswith("b")',
+                 'x in [1, 3]',
+                 '1 < x < 4'):
+        result = df >> query(expr, reset_index=False)
+        assert result.equals(df.query(expr)), expr
+
 
 def test_do():
     df = pd.DataFrame({'x': [1, 2, 2, 3],
@@ -913,6 +1069,12 @@ def test_data_mutability():
     df2.loc[0, 'x'] = 999
     assert df.loc[0, 'x'] != 999
 
+    df2 = df >> rename(z='x')
+    df2.loc[0, 'y'] = 99
+    df2.loc[0, 'z'] = 99
+    assert df.loc[0, 'y'] != 99
+    assert df.loc[0, 'x'] != 99
+
     set_option('modify_input_data', True)
 
     df2 = df.copy()
@@ -75,3 +75,69 @@ def test_n():
     with pytest.raises(TypeError):
         expr = BaseExpression('n/n()', 'n_ratio')
         value = expr.evaluate(df, env)
+
+
+def test_numexpr():
+    pytest.importorskip('numexpr')
+    import numpy as np
+    from plydata.expressions import NUMEXPR_MIN_ROWS, _numexpr_evaluate
+
+    n = NUMEXPR_MIN_ROWS
+    x = np.arange(n)
+    df = pd.DataFrame({'x': x, 'y': np.linspace(0, 1, n)})
+    env = get_empty_env().with_outer_namespace({'np': np, 'w': 3})
+
+    expr = BaseExpression('x**2 + w*y', 'z')
+    value = expr.evaluate(df, env)
+    assert _numexpr_evaluate(expr.stmt, df, env) is not None
+    assert value.index.equals(df.index)
+    np.testing.assert_allclose(value, x**2 + 3*df['y'])
+
+    expr = BaseExpression('np.sin(y) > 0.5', 'z')
+    value = expr.evaluate(df, env)
+    assert all(value == (np.sin(df['y']) > 0.5))
+
+    expr = BaseExpression('x % 2', 'z')
+    assert all(expr.evaluate(df, env) == x % 2)
+
+    # The result does not depend on the size of the data
+    df['v'] = x - 5  # Some negative values
+    small = df.iloc[:10]
+
+    def evaluate(expr, data):
+        try:
+            return pd.Series(expr.evaluate(data, env)).iloc[:10]
+        except ValueError as err:
+            return type(err)
+
+    for stmt in ('np.abs(x)', 'np.absolute(y)', 'np.where(x > 0, 1, 0)',
+                 'np.where(x > 0, y, 0)', 'x % 0', 'y % 2', 'x / 2',
+                 'x * 2', '-x', 'x ** 2', 'np.sqrt(x)', 'x + w*y',
+                 '(x > 1) & (y < 0.5)', 'v ** v', '2 ** v', 'v ** 2',
+                 'v ** w'):
+        expr = BaseExpression(stmt, 'z')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value1 = evaluate(expr, df)
+            value2 = evaluate(expr, small)
+        if value2 is ValueError:
+            # Integers to negative integer powers
+            assert value1 is ValueError, stmt
+            continue
+        assert value1.dtype == value2.dtype, stmt
+        pd.testing.assert_series_equal(
+            value1, value2, check_names=False, obj=stmt)
+
+    # Statements that numexpr does not evaluate
+    for stmt in ('np.cumsum(x)', 'x // 2', 'x + "a"', 'y.max()',
+                 '(x > 1) and (x < 3)', 'x % 2', 'np.abs(x)', 'v ** v',
+                 '2 ** v'):
+        assert _numexpr_evaluate(stmt, df, env) is None
+
+    # Small data
+    assert _numexpr_evaluate('x*2', df.iloc[:3], env) is None
+
+    # A non-numpy function
+    env2 = get_empty_env().with_outer_namespace({'sin': lambda s: s})
+    assert _numexpr_evaluate('sin(x)', df, env2) is None
+    expr = BaseExpression('sin(x)', 'z')
+    assert all(expr.evaluate(df, env2) == x)
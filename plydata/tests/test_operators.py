@@ -17,6 +17,9 @@ def test_get_verb_function():
     func2 = get_verb_function(data2, 'define')
     assert func1 is func2
 
+    # Cached lookups
+    assert get_verb_function(data2, 'define') is func2
+
     with pytest.raises(TypeError):
         get_verb_function(data, 'unknown_verb')
 
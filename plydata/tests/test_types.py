@@ -22,3 +22,12 @@ class TestGroupedDataFrame:
         # the groups will be compared
         assert df.equals(df1)
         assert not df.equals(df2)
+
+    def test_from_frame(self):
+        df1 = df >> ungroup()
+        df2 = type(df)._from_frame(df1, df.plydata_groups)
+        assert df.equals(df2)
+
+        # The groups are not shared
+        df2.plydata_groups.append('y')
+        assert df.plydata_groups == ['x']
@@ -20,6 +20,31 @@ class GroupedDataFrame(pd.DataFrame):
         if groups is not None:
             self.plydata_groups = list(pd.unique(groups))
 
+    @classmethod
+    def _from_frame(cls, data, groups):
+        """
+        Create grouped dataframe that shares the data of a dataframe
+
+        Unlike the constructor, the groups are not checked for
+        duplicates. They must come from another
+        GroupedDataFrame.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame
+            Data
+        groups : list
+            Group columns
+
+        Returns
+        -------
+        out : GroupedDataFrame
+            Grouped data
+        """
+        gdf = cls(data, copy=False)
+        gdf.plydata_groups = list(groups)
+        return gdf
+
     @property
     def _constructor(self):
         return GroupedDataFrame
@@ -54,11 +79,38 @@ class GroupedDataFrame(pd.DataFrame):
         if not self.plydata_groups:
             return np.ones(len(self), dtype=int)
 
-        grouper = self.groupby()
-        indices = np.empty(len(self), dtype=int)
-        for i, (_, idx) in enumerate(sorted(grouper.indices.items())):
-            indices[idx] = i
-        return indices
+        return self._group_codes(sort=True)
+
+    def _group_codes(self, sort=False):
+        """
+        Return dense integer codes of the groups of the rows
+
+        Parameters
+        ----------
+        sort : bool
+            If ``True``, the codes follow the sorted order of the
+            group keys. Otherwise they follow the order in which
+            the groups first appear.
+
+        Returns
+        -------
+        out : numpy.ndarray
+            Group codes. Rows with missing group keys do not
+            belong to any group and have code ``-1``.
+        """
+        n = len(self)
+        codes = np.zeros(n, dtype=np.intp)
+        valid = np.ones(n, dtype=bool)
+        for col in self.plydata_groups:
+            col_codes, uniques = pd.factorize(
+                np.asarray(self[col]), sort=sort)
+            valid &= col_codes >= 0
+            codes = codes * len(uniques) + col_codes
+            # Keep the combined codes small
+            codes[valid] = pd.factorize(codes[valid], sort=sort)[0]
+
+        codes[~valid] = -1
+        return codes
 
     def _repr_html_(self, *args, **kwargs):
         cell = '<td>{}</td>'
@@ -217,6 +217,49 @@ def regular_index(*dfs):
                 df.index = idx
 
 
+def _column_positions(columns):
+    """
+    Return a mapping of column labels to their positions
+
+    The mapping is created once and stored on the columns index.
+    An index is immutable, and changing the columns of a dataframe
+    replaces it, so the mapping cannot go stale.
+
+    Parameters
+    ----------
+    columns : pandas.Index
+        Dataframe columns
+
+    Returns
+    -------
+    out : dict or None
+        Mapping of label to position. ``None`` if the labels
+        are not unique, have missing values or the columns are
+        a MultiIndex. A dict cannot find a NaN label with a
+        different NaN object, like ``Index.get_loc`` does.
+
+    Examples
+    --------
+    >>> _column_positions(pd.Index(['x', 'y', 123]))
+    {'x': 0, 'y': 1, 123: 2}
+    >>> _column_positions(pd.Index(['x', 'y', 'x']))
+    >>> _column_positions(pd.Index(['x', np.nan]))
+    """
+    try:
+        return columns._plydata_positions
+    except AttributeError:
+        pass
+
+    if (columns.is_unique and
+            not columns.hasnans and
+            not isinstance(columns, pd.MultiIndex)):
+        positions = {col: i for i, col in enumerate(columns)}
+    else:
+        positions = None
+    columns._plydata_positions = positions
+    return positions
+
+
 def identity(*args):
     """
     Return whatever is passed in